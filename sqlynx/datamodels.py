@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 
-class SQLResult(BaseModel):
-    columns: list[str]
-    data: list[tuple[int | str | float]]
+@dataclass(frozen=True, slots=True)
+class SQLResult:
+    columns: tuple[str, ...]
+    data: list[tuple]
     metadata: dict
@@ -1,19 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
+import pickle
+import tempfile
 from abc import abstractmethod
+from functools import lru_cache
 from pathlib import Path
+from types import ModuleType
 
 from dotenv import load_dotenv
+from llama_index.core import Settings
 from llama_index.core import SQLDatabase
 from llama_index.core import VectorStoreIndex
 from llama_index.core.indices.struct_store.sql_query import SQLTableRetrieverQueryEngine
 from llama_index.core.objects import ObjectIndex
 from llama_index.core.objects import SQLTableNodeMapping
 from llama_index.core.objects import SQLTableSchema
+from sqlalchemy import bindparam
 from sqlalchemy import create_engine
+from sqlalchemy import inspect
 from sqlalchemy import MetaData
+from sqlalchemy.engine import Connection
 from sqlalchemy.engine import Engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.engine import Result
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.sql import text
@@ -24,6 +36,59 @@ from sqlynx.utils.exceptions import MissingEnvVarError
 load_dotenv()
 
 INDEX_DIRECTORY: Path = Path("storage/sql_index_data")
+INDEX_FINGERPRINT_FILE_NAME: str = "index_fingerprint.json"
+METADATA_CACHE_DIRECTORY: Path = Path("storage/metadata_cache")
+SCHEMA_FINGERPRINT_QUERIES: dict[str, str] = {
+    "postgresql": (
+        "SELECT c.relname, a.attname, format_type(a.atttypid, a.atttypmod) "
+        "FROM pg_catalog.pg_class c "
+        "JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace "
+        "JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid "
+        "WHERE n.nspname = :schema AND c.relname IN :tables "
+        "AND a.attnum > 0 AND NOT a.attisdropped "
+        "ORDER BY c.relname, a.attnum"
+    ),
+    "mysql": (
+        "SELECT table_name, column_name, column_type "
+        "FROM information_schema.columns "
+        "WHERE table_schema = :schema AND table_name IN :tables "
+        "ORDER BY table_name, ordinal_position"
+    ),
+}
+
+
+def _write_atomically(path: Path, data: bytes) -> None:
+    """
+    Write a file through a temporary sibling so readers never see a partial file.
+
+    Args:
+        path (Path): The destination file.
+        data (bytes): The file contents.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary_name = tempfile.mkstemp(dir=path.parent)
+    temporary_path = Path(temporary_name)
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, path)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+
+
+def _in_running_event_loop() -> bool:
+    """
+    Check whether the caller is running inside an asyncio event loop.
+
+    Returns:
+        bool: True inside a running loop (e.g. Jupyter or an async handler).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
 
 
 class SQLEngine:
@@ -41,19 +106,40 @@ class SQLEngine:
     ]
 
     DB_MODULES = {
-        "mysql": ("pymysql", "mysql+pymysql", "3306"),
-        "postgresql": ("psycopg2", "postgresql+psycopg2", "5432"),
+        "mysql": ("MySQLdb", "mysql+mysqldb", "3306"),
+        "postgresql": ("psycopg", "postgresql+psycopg", "5432"),
+    }
+
+    FALLBACK_DB_MODULES = {
+        "mysql": ("pymysql", "mysql+pymysql"),
+        "postgresql": ("psycopg2", "postgresql+psycopg2"),
+    }
+
+    DB_PACKAGES = {
+        "MySQLdb": "mysqlclient",
+        "psycopg": "psycopg[binary]",
+    }
+
+    DB_CONNECT_ARGS = {
+        "postgresql+psycopg": {"prepare_threshold": 1},
+    }
+
+    ENGINE_OPTIONS = {
+        "pool_size": 8,
+        "max_overflow": 16,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_use_lifo": True,
     }
 
     def __init__(self, include_tables: list[str] = None, similarity_top_k: int = 5) -> None:
         """
         Initialize the SQLEngine instance by loading environment variables.
         """
+        self.similarity_top_k = similarity_top_k
         self._load_env_vars()
         self._create_engine()
-        self._sql_database = SQLDatabase(self.engine)
         self.meta = MetaData()
-        self.meta.reflect(bind=self.engine)
 
         self._create_table_objects_and_mappings(include_tables)
         self._init_index()
@@ -99,105 +185,293 @@ class SQLEngine:
 
         Raises:
             ValueError: If the database scheme is unsupported.
-            ImportError: If the necessary database driver is not installed.
+            ImportError: If no supported database driver is installed.
         """
-        if self.db_scheme not in self.DB_MODULES:
-            raise ValueError(
-                "Unsupported database scheme. Supported schemes are `mysql` and `postgresql`.",
-            )
-
-        module_name, db_url_prefix, default_port = self.DB_MODULES[self.db_scheme]
-        self._ensure_module_installed(module_name)
-        self.db_port = self.db_port or default_port
-
-        return (
-            f"{db_url_prefix}://{self.db_user}:"
-            f"{self.db_password}@{self.db_host}:"
-            f"{self.db_port}/{self.db_name}"
+        return self._build_uri_from_settings(
+            self.db_scheme,
+            self.db_user,
+            self.db_password,
+            self.db_host,
+            self.db_port,
+            self.db_name,
         )
 
-    def _ensure_module_installed(self, module_name: str) -> None:
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _build_uri_from_settings(
+        cls,
+        db_scheme: str,
+        db_user: str,
+        db_password: str,
+        db_host: str,
+        db_port: str | None,
+        db_name: str,
+    ) -> str:
         """
-        Ensure that the required database driver module is installed.
+        Build the database URI for the given connection settings, memoized so the
+        driver lookup runs once per process.
 
         Args:
-            module_name (str): The name of the database driver module.
+            db_scheme (str): The database scheme, `mysql` or `postgresql`.
+            db_user (str): The database user.
+            db_password (str): The database password.
+            db_host (str): The database host.
+            db_port (str | None): The database port, or None for the scheme default.
+            db_name (str): The database name.
 
-        Raises:
-            ImportError: If the module is not installed.
+        Returns:
+            str: The constructed database URI.
         """
-        try:
-            __import__(module_name)
-        except ImportError:
-            raise ImportError(
-                f"{module_name} is not installed. Install it using `pip install {module_name}`.",
+        if db_scheme not in cls.DB_MODULES:
+            raise ValueError(
+                "Unsupported database scheme. Supported schemes are `mysql` and `postgresql`.",
             )
 
-    def _create_engine(self) -> Engine:
+        module_name, db_url_prefix, default_port = cls.DB_MODULES[db_scheme]
+        db_url_prefix = cls._ensure_module_installed(
+            module_name,
+            db_url_prefix,
+            cls.FALLBACK_DB_MODULES[db_scheme],
+        )
+        db_port = db_port or default_port
+
+        return f"{db_url_prefix}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _ensure_module_installed(
+        cls,
+        module_name: str,
+        db_url_prefix: str,
+        fallback: tuple[str, str],
+    ) -> str:
         """
-        Create a SQLAlchemy Engine.
+        Ensure that the preferred database driver module, or its fallback, is installed.
+
+        The preferred driver is only chosen when it decodes rows in C; psycopg
+        installed without its C or binary implementation loses to psycopg2, and
+        is used only if psycopg2 is missing.
+
+        Args:
+            module_name (str): The name of the preferred database driver module.
+            db_url_prefix (str): The URL prefix for the preferred driver.
+            fallback (tuple[str, str]): The fallback driver module name and URL prefix.
 
         Returns:
-            Engine: The SQLAlchemy Engine instance.
+            str: The URL prefix of the installed driver.
 
         Raises:
-            DatabaseConnectionError: If the connection to the database fails.
+            ImportError: If neither module is installed.
         """
-        self.uri = self._build_uri()
-        self.engine = create_engine(self.uri)
+        installed_prefix: str | None = None
+        for candidate_module, candidate_prefix in ((module_name, db_url_prefix), fallback):
+            try:
+                module = __import__(candidate_module)
+            except ImportError:
+                continue
+            if cls._is_c_accelerated(module):
+                return candidate_prefix
+            installed_prefix = installed_prefix or candidate_prefix
+
+        if installed_prefix is not None:
+            return installed_prefix
+
+        package_name = cls.DB_PACKAGES.get(module_name, module_name)
+        raise ImportError(
+            f"{module_name} is not installed. Install it using `pip install {package_name}`.",
+        )
+
+    @staticmethod
+    def _is_c_accelerated(module: ModuleType) -> bool:
+        """
+        Check whether a database driver module decodes rows in C.
 
-        if self._check_db_connection():
-            return self.engine
-        else:
-            raise DatabaseConnectionError("Failed to connect to the database.")
+        Args:
+            module (ModuleType): The imported database driver module.
+
+        Returns:
+            bool: False for psycopg running its pure-Python libpq wrapper, True otherwise.
+        """
+        if module.__name__ == "psycopg":
+            return module.pq.__impl__ in ("c", "binary")
+        return True
 
-    def _check_db_connection(self) -> bool:
+    def _create_engine(self) -> Engine:
         """
-        Check the connection to the database.
+        Create a SQLAlchemy Engine backed by a pre-pinged connection pool.
+
+        Connecting is deferred to the first real connection, which reflects
+        the schema in `_create_table_objects_and_mappings`. With psycopg 3, a
+        statement is prepared server-side the second time a connection runs it.
 
         Returns:
-            bool: True if the connection is successful, False otherwise.
+            Engine: The SQLAlchemy Engine instance.
         """
-        try:
-            with self.engine.connect():
-                return True
-        except OperationalError:
-            return False
+        self.uri = self._build_uri()
+        self.engine = create_engine(
+            self.uri,
+            connect_args=self.DB_CONNECT_ARGS.get(make_url(self.uri).drivername, {}),
+            **self.ENGINE_OPTIONS,
+        )
+        return self.engine
 
     def _create_table_objects_and_mappings(
         self,
         include_table: list[str] = None,
     ) -> None:
         """
-        Create table schema objects and table node mappings.
+        Reflect the included tables, then create table schema objects and table node mappings.
 
         Args:
             include_table (list[str]): list of table names to include.
+
+        Raises:
+            DatabaseConnectionError: If the connection to the database fails.
         """
-        if include_table is None:
-            include_table = self.meta.tables.keys()
+        try:
+            with self.engine.connect() as connection:
+                if include_table is None:
+                    include_table = inspect(connection).get_table_names()
+                self._reflect_metadata(connection, include_table)
+        except OperationalError as error:
+            raise DatabaseConnectionError("Failed to connect to the database.") from error
 
+        self._sql_database = SQLDatabase(
+            self.engine,
+            metadata=self.meta,
+            include_tables=include_table,
+        )
         self.table_schema_objects = [
             SQLTableSchema(table_name=table_name) for table_name in include_table
         ]
         self.table_node_mapping = SQLTableNodeMapping(self._sql_database)
 
+    def _reflect_metadata(self, connection: Connection, include_table: list[str]) -> None:
+        """
+        Load the included tables into the metadata, reusing the on-disk cache
+        while the schema fingerprint is unchanged.
+
+        SQLAlchemy 2.x reflects the whole batch through the inspector's
+        ``get_multi_*`` methods; ``resolve_fks=False`` keeps tables referenced
+        by foreign keys from being pulled in one by one.
+
+        Args:
+            connection (Connection): An open connection to reflect through.
+            include_table (list[str]): list of table names to reflect.
+        """
+        cache_key = hashlib.sha1(
+            "|".join(
+                [self.engine.url.render_as_string(hide_password=True), *sorted(include_table)],
+            ).encode(),
+        ).hexdigest()
+        cache_file = METADATA_CACHE_DIRECTORY / f"{cache_key}.pkl"
+        fingerprint_file = METADATA_CACHE_DIRECTORY / f"{cache_key}.fingerprint"
+        fingerprint = self._schema_fingerprint(connection, include_table)
+
+        try:
+            if fingerprint_file.read_text() == fingerprint:
+                with cache_file.open("rb") as file:
+                    self.meta = pickle.load(file)
+                return
+        except Exception:
+            # The cache is best-effort: a missing, unreadable, truncated or
+            # incompatible cache falls through to reflection.
+            pass
+
+        self.meta.reflect(
+            bind=connection,
+            only=include_table,
+            views=False,
+            resolve_fks=False,
+        )
+
+        try:
+            _write_atomically(cache_file, pickle.dumps(self.meta))
+            _write_atomically(fingerprint_file, fingerprint.encode())
+        except Exception:
+            # Failing to persist the cache must not fail a successful reflection.
+            pass
+
+    def _schema_fingerprint(self, connection: Connection, include_table: list[str]) -> str:
+        """
+        Compute a fingerprint of the included tables' columns from the system catalog.
+
+        Args:
+            connection (Connection): An open connection to query through.
+            include_table (list[str]): list of table names to fingerprint.
+
+        Returns:
+            str: A sha1 hex digest that changes whenever a column is added,
+                 removed, renamed or retyped.
+        """
+        statement = text(SCHEMA_FINGERPRINT_QUERIES[connection.dialect.name]).bindparams(
+            bindparam("tables", expanding=True),
+        )
+        rows = connection.execute(
+            statement,
+            {"schema": connection.dialect.default_schema_name, "tables": list(include_table)},
+        )
+        digest = hashlib.sha1()
+        for table_name, column_name, data_type in rows:
+            digest.update(f"{table_name}.{column_name}:{data_type};".encode())
+        return digest.hexdigest()
+
     def _init_index(self) -> None:
         """
-        Initialize index.
+        Initialize index, rebuilding it only when the included tables or the
+        embedding model differ from those of the persisted index.
+
+        Each fingerprint is persisted in its own subdirectory of INDEX_DIRECTORY,
+        so engines over different table sets do not overwrite each other's index.
+        Rebuilds embed the table schemas in `embed_batch_size` batches. Outside a
+        running event loop the batches are sent to the embedding provider
+        concurrently; inside one, llama-index cannot start its own loop, so they
+        are sent one after another.
         """
+        fingerprint = self._index_fingerprint()
+        index_directory = (
+            INDEX_DIRECTORY
+            / hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+        )
+        fingerprint_file = index_directory / INDEX_FINGERPRINT_FILE_NAME
+
         try:
-            self.object_index = ObjectIndex.from_persist_dir(
-                persist_dir=INDEX_DIRECTORY,
-                object_node_mapping=self.table_node_mapping,
-            )
-        except FileNotFoundError:
-            self.object_index = ObjectIndex.from_objects(
-                objects=self.table_schema_objects,
-                object_mapping=self.table_node_mapping,
-                index_cls=VectorStoreIndex,
-            )
-            self.object_index.persist(persist_dir=INDEX_DIRECTORY)
+            persisted_fingerprint = json.loads(fingerprint_file.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            persisted_fingerprint = None
+
+        if persisted_fingerprint == fingerprint:
+            try:
+                self.object_index = ObjectIndex.from_persist_dir(
+                    persist_dir=index_directory,
+                    object_node_mapping=self.table_node_mapping,
+                )
+                return
+            except FileNotFoundError:
+                pass
+
+        self.object_index = ObjectIndex.from_objects(
+            objects=self.table_schema_objects,
+            object_mapping=self.table_node_mapping,
+            index_cls=VectorStoreIndex,
+            use_async=not _in_running_event_loop(),
+        )
+        self.object_index.persist(persist_dir=index_directory)
+        _write_atomically(fingerprint_file, json.dumps(fingerprint).encode())
+
+    def _index_fingerprint(self) -> dict[str, str]:
+        """
+        Describe what the object index is built from.
+
+        Returns:
+            dict[str, str]: The sha1 of the sorted included table names and the
+                            name of the embedding model.
+        """
+        table_names = sorted(schema.table_name for schema in self.table_schema_objects)
+        return {
+            "tables": hashlib.sha1("|".join(table_names).encode()).hexdigest(),
+            "embed_model": Settings.embed_model.model_name,
+        }
 
     def _create_query_engine(self) -> SQLTableRetrieverQueryEngine:
         """
@@ -208,7 +482,7 @@ class SQLEngine:
         """
         return SQLTableRetrieverQueryEngine(
             sql_database=self._sql_database,
-            table_retriever=self.object_index.as_retriever(similarity_top_k=5),
+            table_retriever=self.object_index.as_retriever(similarity_top_k=self.similarity_top_k),
             sql_only=True,
         )
 
@@ -239,3 +513,49 @@ class SQLEngine:
                 return True, result
         except OperationalError as error:
             return False, error
+
+
+def get_sql_engine(
+    include_tables: list[str] | tuple[str, ...] | None = None,
+    similarity_top_k: int = 5,
+) -> SQLEngine:
+    """
+    Get the process-wide SQLEngine for the given configuration.
+
+    Reflection, the connection pool and the object index are built once and
+    shared by every caller asking for the same tables, in any order.
+
+    Args:
+        include_tables (list[str] | tuple[str, ...] | None): Table names to include,
+            or None for all tables.
+        similarity_top_k (int): Number of tables the retriever returns per question.
+
+    Returns:
+        SQLEngine: The shared SQLEngine instance.
+    """
+    return _get_cached_sql_engine(
+        tuple(sorted(set(include_tables))) if include_tables is not None else None,
+        similarity_top_k,
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_cached_sql_engine(
+    include_tables: tuple[str, ...] | None,
+    similarity_top_k: int,
+) -> SQLEngine:
+    """
+    Build the SQLEngine for a canonical configuration, once per process.
+
+    Args:
+        include_tables (tuple[str, ...] | None): Sorted, de-duplicated table names,
+            or None for all tables.
+        similarity_top_k (int): Number of tables the retriever returns per question.
+
+    Returns:
+        SQLEngine: The shared SQLEngine instance.
+    """
+    return SQLEngine(
+        include_tables=list(include_tables) if include_tables is not None else None,
+        similarity_top_k=similarity_top_k,
+    )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+
 from llama_index.agent.openai import OpenAIAgent
 from llama_index.core.indices.struct_store.sql_query import SQLTableRetrieverQueryEngine
 from llama_index.core.response import Response
@@ -8,8 +10,11 @@ from sqlalchemy.engine import Result
 from sqlalchemy.exc import OperationalError
 
 from sqlynx.datamodels import SQLResult
+from sqlynx.engines.sql import get_sql_engine
 from sqlynx.engines.sql import SQLEngine
 
+SQL_QUERY_CACHE_SIZE: int = 512
+
 
 class SQLQueryTool(BaseToolSpec):
     """
@@ -25,18 +30,27 @@ class SQLQueryTool(BaseToolSpec):
 
     spec_functions = ["generate_sql_query", "execute_sql_query"]
 
-    def __init__(self):
+    def __init__(self, include_tables: list[str] = None):
         """
         Initializes the SQLQueryTool instance.
+
+        Args:
+            include_tables (list[str]): list of table names to query, or None for all tables.
         """
         super().__init__()
-        self.sql_engine: SQLEngine = SQLEngine()
+        self.sql_engine: SQLEngine = get_sql_engine(include_tables)
         self.query_engine: SQLTableRetrieverQueryEngine = self.sql_engine.get_query_engine()
+        self._sql_query_cache: OrderedDict[str, str] = OrderedDict()
+        self.user_question: str | None = None
 
     def generate_sql_query(self, user_question: str) -> str:
         """
         Generate SQL query based on the user's question.
 
+        A question whose SQL already executed successfully is answered from the
+        cache; otherwise the query engine is asked and nothing is cached until
+        `execute_sql_query` succeeds.
+
         Args:
             user_question (str): The question posed by the user,
             which serves as the basis for the SQL query.
@@ -44,10 +58,56 @@ class SQLQueryTool(BaseToolSpec):
         Returns:
             response (str): SQL Query generated based on user query.
         """
-        self.user_question: str = user_question
-        response: Response = self.query_engine.query(self.user_question)
-        generated_sql_query: str = response.metadata.get("sql_query")
-        return generated_sql_query
+        self.user_question = user_question
+        cache_key: str = self._question_cache_key(user_question)
+        if cache_key in self._sql_query_cache:
+            self._sql_query_cache.move_to_end(cache_key)
+            return self._sql_query_cache[cache_key]
+
+        return self._query_sql(user_question)
+
+    def _query_sql(self, user_question: str) -> str | None:
+        """
+        Ask the query engine for a SQL query, bypassing the cache.
+
+        Args:
+            user_question (str): The question posed by the user.
+
+        Returns:
+            response (str | None): SQL Query generated based on user query,
+            or None if the query engine produced none.
+        """
+        response: Response = self.query_engine.query(user_question)
+        return response.metadata.get("sql_query")
+
+    def _question_cache_key(self, user_question: str) -> str:
+        """
+        Collapse whitespace so trivially different spacings share an entry. Case is
+        kept, because it can be part of a literal the SQL compares against.
+
+        Args:
+            user_question (str): The question posed by the user.
+
+        Returns:
+            cache_key (str): The normalized question.
+        """
+        return " ".join(user_question.split())
+
+    def _cache_sql_query(self, cache_key: str, generated_sql_query: str | None) -> None:
+        """
+        Remember a SQL query that executed successfully, evicting the least recently
+        used entry when full. Empty answers are not cached.
+
+        Args:
+            cache_key (str): The normalized question.
+            generated_sql_query (str | None): The generated SQL query.
+        """
+        if not generated_sql_query:
+            return
+        self._sql_query_cache[cache_key] = generated_sql_query
+        self._sql_query_cache.move_to_end(cache_key)
+        if len(self._sql_query_cache) > SQL_QUERY_CACHE_SIZE:
+            self._sql_query_cache.popitem(last=False)
 
     def execute_sql_query(self, generated_sql_query: str) -> Result:
         """
@@ -63,6 +123,12 @@ class SQLQueryTool(BaseToolSpec):
         result: Result | OperationalError
         success, result = self.sql_engine.execute_query(generated_sql_query)
         normalized_result = self.normalize_result(result)
+        if self.user_question is not None:
+            cache_key: str = self._question_cache_key(self.user_question)
+            if success:
+                self._cache_sql_query(cache_key, generated_sql_query)
+            else:
+                self._sql_query_cache.pop(cache_key, None)
         if not success:
             self.refine_sql_query(self.user_question, generated_sql_query, normalized_result)
         return normalized_result
@@ -79,8 +145,13 @@ class SQLQueryTool(BaseToolSpec):
         Returns:
             result (Result): The result of the refined and re-executed query.
         """
-        new_query = self.generate_sql_query(user_question)
+        cache_key: str = self._question_cache_key(user_question)
+        new_query = self._query_sql(user_question)
         success, result = self.sql_engine.execute_query(new_query)
+        if success:
+            self._cache_sql_query(cache_key, new_query)
+        else:
+            self._sql_query_cache.pop(cache_key, None)
         normalized_result = self.normalize_result(result)
         return normalized_result
 
@@ -97,7 +168,7 @@ class SQLQueryTool(BaseToolSpec):
         if isinstance(result, OperationalError):
             error_message = str(result)
             return SQLResult(
-                columns=[],
+                columns=(),
                 data=[],
                 metadata={
                     "is_visualizable": False,
@@ -106,8 +177,8 @@ class SQLQueryTool(BaseToolSpec):
                 },
             )
 
-        columns: list(str) = result.keys()
-        data: list(tuple) = [tuple(row) for row in result.fetchall()]
+        columns: tuple[str, ...] = tuple(result.keys()) if result.returns_rows else ()
+        data: list[tuple] = list(map(tuple, result)) if result.returns_rows else []
         is_visualizable: bool = len(columns) > 1 or len(data) > 1
         is_single_value: bool = len(columns) == 1 and len(data) == 1
 
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+from unittest import mock
+
+import pytest
+from llama_index.core import Settings
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.objects import SQLTableSchema
+from sqlalchemy import Column
+from sqlalchemy import create_engine
+from sqlalchemy import Integer
+from sqlalchemy import MetaData
+from sqlalchemy import String
+from sqlalchemy import Table
+
+from sqlynx.engines import sql
+
+
+@pytest.fixture
+def cache_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(sql, "METADATA_CACHE_DIRECTORY", tmp_path / "metadata_cache")
+    monkeypatch.setattr(sql, "INDEX_DIRECTORY", tmp_path / "sql_index_data")
+    return tmp_path
+
+
+@pytest.fixture
+def database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    schema = MetaData()
+    Table("users", schema, Column("id", Integer, primary_key=True), Column("name", String))
+    Table("orders", schema, Column("id", Integer, primary_key=True))
+    schema.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def make_engine(database, fingerprint="v1"):
+    sql_engine = sql.SQLEngine.__new__(sql.SQLEngine)
+    sql_engine.engine = database
+    sql_engine.meta = MetaData()
+    sql_engine._schema_fingerprint = mock.Mock(return_value=fingerprint)
+    return sql_engine
+
+
+def reflect(sql_engine, include_table):
+    with sql_engine.engine.connect() as connection:
+        sql_engine._reflect_metadata(connection, include_table)
+
+
+def test_reflect_metadata_only_reflects_included_tables(cache_dirs, database):
+    sql_engine = make_engine(database)
+    reflect(sql_engine, ["users"])
+    assert set(sql_engine.meta.tables) == {"users"}
+
+
+def test_reflect_metadata_reuses_cache_while_fingerprint_matches(cache_dirs, database):
+    reflect(make_engine(database), ["users"])
+
+    sql_engine = make_engine(database)
+    with mock.patch.object(MetaData, "reflect") as reflect_mock:
+        reflect(sql_engine, ["users"])
+
+    reflect_mock.assert_not_called()
+    assert set(sql_engine.meta.tables) == {"users"}
+
+
+def test_reflect_metadata_reflects_again_when_fingerprint_changes(cache_dirs, database):
+    reflect(make_engine(database, fingerprint="v1"), ["users"])
+
+    sql_engine = make_engine(database, fingerprint="v2")
+    with mock.patch.object(MetaData, "reflect", autospec=True) as reflect_mock:
+        reflect(sql_engine, ["users"])
+
+    reflect_mock.assert_called_once()
+
+
+@pytest.mark.parametrize("contents", [b"", b"not a pickle", b"\x80\x04\x95"])
+def test_reflect_metadata_falls_back_on_corrupt_cache(cache_dirs, database, contents):
+    reflect(make_engine(database), ["users"])
+    (cache_file,) = (cache_dirs / "metadata_cache").glob("*.pkl")
+    cache_file.write_bytes(contents)
+
+    sql_engine = make_engine(database)
+    reflect(sql_engine, ["users"])
+
+    assert set(sql_engine.meta.tables) == {"users"}
+    assert cache_file.read_bytes() != contents
+
+
+def test_reflect_metadata_survives_unwritable_cache(cache_dirs, database, monkeypatch):
+    monkeypatch.setattr(sql, "_write_atomically", mock.Mock(side_effect=OSError("read-only")))
+
+    sql_engine = make_engine(database)
+    reflect(sql_engine, ["users"])
+
+    assert set(sql_engine.meta.tables) == {"users"}
+
+
+def test_write_atomically_removes_temporary_file_on_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(sql.os, "replace", mock.Mock(side_effect=OSError("disk full")))
+
+    with pytest.raises(OSError):
+        sql._write_atomically(tmp_path / "cache" / "file.pkl", b"data")
+
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+@pytest.fixture
+def object_index(monkeypatch):
+    object_index_cls = mock.Mock()
+    monkeypatch.setattr(sql, "ObjectIndex", object_index_cls)
+    monkeypatch.setattr(Settings, "_embed_model", MockEmbedding(embed_dim=8))
+    return object_index_cls
+
+
+def init_index(table_names):
+    sql_engine = sql.SQLEngine.__new__(sql.SQLEngine)
+    sql_engine.table_schema_objects = [
+        SQLTableSchema(table_name=table_name) for table_name in table_names
+    ]
+    sql_engine.table_node_mapping = mock.Mock()
+    sql_engine._init_index()
+    return sql_engine
+
+
+def test_init_index_builds_then_loads_persisted_index(cache_dirs, object_index):
+    init_index(["users"])
+    object_index.from_objects.assert_called_once()
+    object_index.from_persist_dir.assert_not_called()
+
+    init_index(["users"])
+    object_index.from_objects.assert_called_once()
+    object_index.from_persist_dir.assert_called_once()
+
+
+def test_init_index_keeps_one_index_per_table_set(cache_dirs, object_index):
+    init_index(["users"])
+    init_index(["orders", "users"])
+    assert object_index.from_objects.call_count == 2
+
+    init_index(["users", "orders"])
+    init_index(["users"])
+    assert object_index.from_objects.call_count == 2
+    persist_dirs = {
+        call.kwargs["persist_dir"] for call in object_index.from_persist_dir.call_args_list
+    }
+    assert len(persist_dirs) == 2
+
+
+def test_init_index_rebuilds_on_corrupt_fingerprint(cache_dirs, object_index):
+    init_index(["users"])
+    (fingerprint_file,) = (cache_dirs / "sql_index_data").glob(
+        f"*/{sql.INDEX_FINGERPRINT_FILE_NAME}",
+    )
+    fingerprint_file.write_text("{truncated")
+
+    init_index(["users"])
+
+    assert object_index.from_objects.call_count == 2
+    object_index.from_persist_dir.assert_not_called()
+    assert json.loads(fingerprint_file.read_text())["embed_model"] == "unknown"
+
+
+def test_get_sql_engine_shares_engine_for_same_table_set(monkeypatch):
+    monkeypatch.setattr(sql, "SQLEngine", mock.Mock(side_effect=lambda **kwargs: object()))
+    sql._get_cached_sql_engine.cache_clear()
+    try:
+        first = sql.get_sql_engine(["b", "a"])
+        assert sql.get_sql_engine(("a", "b", "a")) is first
+        assert sql.get_sql_engine(None) is not first
+        sql.SQLEngine.assert_any_call(include_tables=["a", "b"], similarity_top_k=5)
+    finally:
+        sql._get_cached_sql_engine.cache_clear()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import ProgrammingError
+
+from sqlynx.tools import sql
+
+
+class FakeSQLEngine:
+    """
+    Stand-in for SQLEngine whose query engine answers from a list of SQL strings
+    and whose executions succeed unless the SQL is listed as failing.
+    """
+
+    def __init__(self, answers, failing=(), raising=()):
+        self.answers = list(answers)
+        self.failing = set(failing)
+        self.raising = set(raising)
+        self.query_engine = mock.Mock()
+        self.query_engine.query.side_effect = lambda question: SimpleNamespace(
+            metadata={"sql_query": self.answers.pop(0)},
+        )
+
+    def get_query_engine(self):
+        return self.query_engine
+
+    def execute_query(self, sql_query):
+        if sql_query in self.raising:
+            raise ProgrammingError(sql_query, {}, Exception("syntax error"))
+        if sql_query in self.failing:
+            return False, OperationalError(sql_query, {}, Exception("no such table"))
+        return True, SimpleNamespace(returns_rows=False)
+
+
+@pytest.fixture
+def make_tool(monkeypatch):
+    def _make_tool(*args, **kwargs):
+        sql_engine = FakeSQLEngine(*args, **kwargs)
+        monkeypatch.setattr(sql, "get_sql_engine", lambda include_tables: sql_engine)
+        return sql.SQLQueryTool()
+
+    return _make_tool
+
+
+def ask(tool, question):
+    generated_sql_query = tool.generate_sql_query(question)
+    tool.execute_sql_query(generated_sql_query)
+    return generated_sql_query
+
+
+def test_executed_sql_is_served_from_cache(make_tool):
+    tool = make_tool(["SELECT 1"])
+    assert ask(tool, "how many users") == "SELECT 1"
+    assert ask(tool, "how   many users ") == "SELECT 1"
+    assert tool.query_engine.query.call_count == 1
+
+
+def test_sql_is_not_cached_before_it_executes(make_tool):
+    tool = make_tool(["SELECT 1", "SELECT 2"])
+    assert tool.generate_sql_query("how many users") == "SELECT 1"
+    assert tool.generate_sql_query("how many users") == "SELECT 2"
+
+
+def test_sql_raising_on_execution_is_not_cached(make_tool):
+    tool = make_tool(["SELEC 1", "SELECT 1"], raising=["SELEC 1"])
+    with pytest.raises(ProgrammingError):
+        ask(tool, "how many users")
+    assert ask(tool, "how many users") == "SELECT 1"
+
+
+def test_empty_sql_is_not_cached(make_tool):
+    tool = make_tool([None, "SELECT 1"])
+    assert tool.generate_sql_query("how many users") is None
+    assert ask(tool, "how many users") == "SELECT 1"
+
+
+def test_question_case_is_part_of_the_cache_key(make_tool):
+    tool = make_tool(["SELECT 'acme'", "SELECT 'ACME'"])
+    assert ask(tool, "names of acme") == "SELECT 'acme'"
+    assert ask(tool, "names of ACME") == "SELECT 'ACME'"
+
+
+def test_refined_sql_replaces_failing_sql(make_tool):
+    tool = make_tool(["SELECT bad", "SELECT good"], failing=["SELECT bad"])
+    assert ask(tool, "how many users") == "SELECT bad"
+    assert ask(tool, "how many users") == "SELECT good"
+    assert tool.query_engine.query.call_count == 2
+
+
+def test_failing_refinement_drops_cached_sql(make_tool):
+    tool = make_tool(
+        ["SELECT 1", "SELECT 2", "SELECT 3"],
+        failing=["SELECT 1", "SELECT 2"],
+    )
+    ask(tool, "how many users")
+    assert tool._sql_query_cache == {}
+
+
+def test_cached_sql_that_starts_failing_is_dropped(make_tool):
+    tool = make_tool(["SELECT 1", "SELECT 2", "SELECT 3"])
+    ask(tool, "how many users")
+    tool.sql_engine.failing = {"SELECT 1", "SELECT 2"}
+    ask(tool, "how many users")
+    assert tool._sql_query_cache == {}
+    assert ask(tool, "how many users") == "SELECT 3"
+
+
+def test_least_recently_used_sql_is_evicted(make_tool, monkeypatch):
+    monkeypatch.setattr(sql, "SQL_QUERY_CACHE_SIZE", 2)
+    tool = make_tool(["SELECT 1", "SELECT 2", "SELECT 3", "SELECT 4"])
+    ask(tool, "first")
+    ask(tool, "second")
+    ask(tool, "first")
+    ask(tool, "third")
+
+    assert list(tool._sql_query_cache) == ["first", "third"]
+    assert ask(tool, "second") == "SELECT 4"